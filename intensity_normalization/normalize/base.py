@@ -102,6 +102,8 @@ class NormalizeMixin(metaclass=abc.ABCMeta):
             mask = self.skull_stripped_foreground(
                 image, background_threshold=background_threshold
             )
+        if mask.dtype == bool:
+            return mask
         out: intnormt.ImageLike = mask > 0.0
         return out
 
@@ -156,7 +158,9 @@ class LocationScaleMixin(NormalizeMixin, metaclass=abc.ABCMeta):
         loc = self.calculate_location(image, mask, modality=modality)
         scale = self.calculate_scale(image, mask, modality=modality)
         self.teardown()
-        normalized: intnormt.ImageLike = (image - loc) * (self.norm_value / scale)
+        # scale in-place to avoid allocating a second image-sized temporary
+        normalized: intnormt.ImageLike = image - loc
+        normalized *= self.norm_value / scale
         return normalized
 
 
@@ -13,6 +13,7 @@ import typing
 import numpy as np
 import numpy.typing as npt
 
+import intensity_normalization.errors as intnorme
 import intensity_normalization.normalize.base as intnormb
 import intensity_normalization.typing as intnormt
 import intensity_normalization.util.histogram_tools as intnormhisttool
@@ -28,18 +29,22 @@ class WhiteStripeNormalize(
         width: float = 0.05,
         width_l: float | None = None,
         width_u: float | None = None,
+        n_bins: int = 2000,
         **kwargs: typing.Any,
     ):
         """
         Find the normal-appearing white matter of the input MR image and
         use those values to standardize the data (i.e., subtract the mean of
         the values in the indices and divide by the std of those values).
-        See the original paper for details on width.
+        See the original paper for details on width. n_bins is the number of
+        histogram bins used to speed up finding the stripe bounds.
         """
         super().__init__(norm_value=norm_value, **kwargs)
         self.width_l = width_l or width
         self.width_u = width_u or width
+        self.n_bins = n_bins
         self.whitestripe: npt.NDArray | None = None
+        self._whitestripe_values: intnormt.ImageLike | None = None
 
     def calculate_location(
         self,
@@ -49,7 +54,9 @@ class WhiteStripeNormalize(
         *,
         modality: intnormt.Modality = intnormt.Modality.T1,
     ) -> float:
-        loc: float = image[self.whitestripe].mean()
+        if self._whitestripe_values is None:
+            raise intnorme.NormalizationError("'whitestripe' needs to be set.")
+        loc: float = float(self._whitestripe_values.mean())
         return loc
 
     def calculate_scale(
@@ -60,7 +67,9 @@ class WhiteStripeNormalize(
         *,
         modality: intnormt.Modality = intnormt.Modality.T1,
     ) -> float:
-        scale: float = image[self.whitestripe].std()
+        if self._whitestripe_values is None:
+            raise intnorme.NormalizationError("'whitestripe' needs to be set.")
+        scale: float = float(self._whitestripe_values.std())
         return scale
 
     def setup(
@@ -74,19 +83,30 @@ class WhiteStripeNormalize(
         if modality is None:
             modality = "t1"
         mask = self._get_mask(image, mask, modality=modality)
-        masked = image * mask
         voi = image[mask]
+        # the KDE works in float64, so give it the VOI in its native dtype
         wm_mode = intnormhisttool.get_tissue_mode(voi, modality=modality)
-        wm_mode_quantile: float = np.mean(voi < wm_mode).item()
+        # float32 halves the memory traffic of the remaining passes over the VOI
+        voi = voi.astype(np.float32, copy=False)
+        wm_mode_quantile: float = np.count_nonzero(voi < wm_mode) / voi.size
         lower_bound = max(wm_mode_quantile - self.width_l, 0.0)
         upper_bound = min(wm_mode_quantile + self.width_u, 1.0)
+        counts, bin_edges = np.histogram(voi, bins=self.n_bins)
         ws_l: float
         ws_u: float
-        ws_l, ws_u = np.quantile(voi, (lower_bound, upper_bound))
-        self.whitestripe = (masked > ws_l) & (masked < ws_u)
+        ws_l, ws_u = intnormhisttool.quantiles_from_histogram(
+            voi, counts, bin_edges, (lower_bound, upper_bound)
+        )
+        # combine in-place to keep at most one temporary boolean image around
+        whitestripe = image > ws_l
+        whitestripe &= image < ws_u
+        whitestripe &= mask
+        self.whitestripe = whitestripe
+        self._whitestripe_values = image[whitestripe].astype(np.float32, copy=False)
 
     def teardown(self) -> None:
         del self.whitestripe
+        self._whitestripe_values = None
 
     @staticmethod
     def name() -> str:
@@ -241,7 +241,7 @@ def plot_histogram(
     if ax is None:
         _, ax = plt.subplots()
     data = image[image > image.mean()] if mask is None else image[mask > 0.0]
-    hist, bin_edges = np.histogram(data.flatten(), n_bins, **kwargs)
+    hist, bin_edges = np.histogram(data, n_bins, **kwargs)
     bins = np.diff(bin_edges) / 2 + bin_edges[:-1]
     if log:
         # catch divide by zero warnings in call to log
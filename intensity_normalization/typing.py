@@ -478,6 +478,10 @@ class ImageLike(typing.Protocol[S_co, T_co, U_co]):
     def sum(self) -> Float | Int:
         ...
 
+    @property
+    def dtype(self) -> np.dtype:
+        ...
+
     @property
     def ndim(self) -> Int:
         ...
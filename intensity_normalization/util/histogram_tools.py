@@ -10,11 +10,12 @@ __all__ = [
     "get_largest_tissue_mode",
     "get_last_tissue_mode",
     "get_tissue_mode",
+    "quantiles_from_histogram",
     "smooth_histogram",
 ]
 
 import numpy as np
-import scipy.signal
+import numpy.typing as npt
 import statsmodels.api as sm
 
 import intensity_normalization as intnorm
@@ -33,7 +34,8 @@ def smooth_histogram(
         grid: domain of the pdf
         pdf: kernel density estimate of the pdf of data
     """
-    image_vec: np.ndarray = np.asarray(image.flatten(), dtype=np.float64)
+    # asarray + ravel only copies when needed (vs. flatten, which always does)
+    image_vec: np.ndarray = np.asarray(image, dtype=np.float64).ravel()
     bandwidth = image_vec.max() / 80
     kde = sm.nonparametric.KDEUnivariate(image_vec)
     kde.fit(kernel="gau", bw=bandwidth, gridsize=80, fft=True)
@@ -74,15 +76,9 @@ def get_last_tissue_mode(
     Returns:
         last_tissue_mode: mode of the highest-intensity tissue class
     """
-    if not (0.0 < tail_percentage < 100.0):
-        msg = f"'tail_percentage' must be in (0, 100). Got '{tail_percentage}'."
-        raise ValueError(msg)
-    if remove_tail:
-        threshold: float = float(np.percentile(image, tail_percentage))
-        valid_mask: intnormt.ImageLike = image <= threshold
-        image = image[valid_mask]
-    grid, pdf = smooth_histogram(image)
-    maxima = scipy.signal.argrelmax(pdf)[0]
+    grid, maxima = _tissue_mode_maxima(
+        image, remove_tail=remove_tail, tail_percentage=tail_percentage
+    )
     last_tissue_mode: float = grid[maxima[-1]]
     return last_tissue_mode
 
@@ -105,15 +101,9 @@ def get_first_tissue_mode(
     Returns:
         first_tissue_mode: mode of the lowest-intensity tissue class
     """
-    if not (0.0 < tail_percentage < 100.0):
-        msg = f"'tail_percentage' must be in (0, 100). Got '{tail_percentage}'."
-        raise ValueError(msg)
-    if remove_tail:
-        threshold: float = float(np.percentile(image, tail_percentage))
-        valid_mask: intnormt.ImageLike = image <= threshold
-        image = image[valid_mask]
-    grid, pdf = smooth_histogram(image)
-    maxima = scipy.signal.argrelmax(pdf)[0]
+    grid, maxima = _tissue_mode_maxima(
+        image, remove_tail=remove_tail, tail_percentage=tail_percentage
+    )
     first_tissue_mode: float = grid[maxima[0]]
     return first_tissue_mode
 
@@ -134,3 +124,73 @@ def get_tissue_mode(
         msg = f"Modality '{modality}' not valid. Needs to be one of {{{modalities}}}."
         raise ValueError(msg)
     return mode
+
+
+def quantiles_from_histogram(
+    data: intnormt.ImageLike,
+    counts: intnormt.ImageLike,
+    bin_edges: intnormt.ImageLike,
+    /,
+    quantiles: npt.ArrayLike,
+) -> intnormt.ImageLike:
+    """Quantiles of data found with the help of its histogram
+
+    The cumulative counts locate the bin holding each required order
+    statistic, so only the data in those bins needs to be partitioned
+    (instead of all of it, as in np.quantile). The result is the same
+    as np.quantile with the default (linear) method.
+
+    Args:
+        data: array of image data (like an np.ndarray)
+        counts: histogram of data with uniform bins (e.g., from np.histogram)
+        bin_edges: edges of the bins (one more element than counts)
+        quantiles: quantiles to compute, each in [0, 1]
+
+    Returns:
+        values: quantiles of data
+    """
+    cum_counts = np.cumsum(counts)
+    n = int(cum_counts[-1])
+    position = (n - 1) * np.asarray(quantiles, dtype=np.float64)
+    lower_rank = np.floor(position).astype(np.int64)
+    upper_rank = np.minimum(lower_rank + 1, n - 1)
+    ranks = np.concatenate((lower_rank, upper_rank))
+    rank_bins = np.searchsorted(cum_counts, ranks, side="right")
+    order_stats = np.empty(ranks.size, dtype=np.float64)
+    last_bin = np.size(counts) - 1
+    for b in np.unique(rank_bins):
+        in_bin = rank_bins == b
+        # mirror np.histogram: bins are half-open except for the last one
+        selected = data >= bin_edges[b]
+        if b == last_bin:
+            selected &= data <= bin_edges[b + 1]
+        else:
+            selected &= data < bin_edges[b + 1]
+        ranks_in_bin = ranks[in_bin] - (cum_counts[b] - counts[b])
+        order_stats[in_bin] = np.partition(data[selected], ranks_in_bin)[ranks_in_bin]
+    lower, upper = np.split(order_stats, 2)
+    values: intnormt.ImageLike = lower + (position - lower_rank) * (upper - lower)
+    return values
+
+
+def _tissue_mode_maxima(
+    image: intnormt.ImageLike,
+    /,
+    *,
+    remove_tail: bool,
+    tail_percentage: float,
+) -> tuple[intnormt.ImageLike, intnormt.ImageLike]:
+    """Grid of the smoothed histogram and indices of its local maxima"""
+    if not (0.0 < tail_percentage < 100.0):
+        msg = f"'tail_percentage' must be in (0, 100). Got '{tail_percentage}'."
+        raise ValueError(msg)
+    if remove_tail:
+        threshold: float = float(np.percentile(image, tail_percentage))
+        valid_mask: intnormt.ImageLike = image <= threshold
+        image = image[valid_mask]
+    grid, pdf = smooth_histogram(image)
+    # strict local maxima (same as scipy.signal.argrelmax w/ order=1)
+    inner = pdf[1:-1]
+    is_max = (inner > pdf[:-2]) & (inner > pdf[2:])
+    maxima = np.flatnonzero(is_max) + 1
+    return grid, maxima
@@ -4,8 +4,10 @@ import os
 import pathlib
 import typing
 
+import numpy as np
 import pytest
 
+import intensity_normalization.typing as intnormt
 from intensity_normalization.cli.fcm import fcm_main
 from intensity_normalization.cli.histogram import histogram_main as hist_main
 from intensity_normalization.cli.kde import kde_main
@@ -16,6 +18,8 @@ from intensity_normalization.cli.tissue_membership import (
 )
 from intensity_normalization.cli.whitestripe import whitestripe_main as ws_main
 from intensity_normalization.cli.zscore import zscore_main as zs_main
+from intensity_normalization.normalize.whitestripe import WhiteStripeNormalize
+from intensity_normalization.util.histogram_tools import quantiles_from_histogram
 
 
 def test_fcm_normalization_cli(base_cli_image_args: typing.List[str]) -> None:
@@ -39,6 +43,18 @@ def test_ws_normalization_cli(base_cli_image_args: typing.List[str]) -> None:
     assert retval == 0
 
 
+def test_ws_stripe_inside_mask_with_negative_lower_bound() -> None:
+    rng = np.random.default_rng(0)
+    image = rng.normal(0.0, 1.0, (20, 20, 20))
+    mask = rng.random((20, 20, 20)) > 0.5
+    ws = WhiteStripeNormalize(width=0.2)
+    ws.setup(image, mask, modality=intnormt.Modality.T2)
+    assert ws.whitestripe is not None
+    # the stripe straddles zero, the value of out-of-mask voxels in image * mask
+    assert image[ws.whitestripe].min() < 0.0 < image[ws.whitestripe].max()
+    assert not ws.whitestripe[~mask].any()
+
+
 def test_zscore_normalization_cli(base_cli_image_args: typing.List[str]) -> None:
     retval = zs_main(base_cli_image_args)
     assert retval == 0
@@ -119,3 +135,19 @@ def test_tissue_membership_hard_seg_cli(
     tissue_membership_cli_args.append("-hs")
     retval = tm_main(tissue_membership_cli_args)
     assert retval == 0
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("discrete", [False, True])
+@pytest.mark.parametrize("quantiles", [(0.45, 0.55), (0.0, 1.0)])
+def test_quantiles_from_histogram(
+    dtype: type, discrete: bool, quantiles: typing.Tuple[float, float]
+) -> None:
+    rng = np.random.default_rng(0)
+    data = rng.normal(0.0, 100.0, 10_000)
+    if discrete:
+        data = np.round(data)
+    data = data.astype(dtype)
+    counts, bin_edges = np.histogram(data, bins=200)
+    values = quantiles_from_histogram(data, counts, bin_edges, quantiles)
+    assert np.allclose(values, np.quantile(data, quantiles))